@@ -5,29 +5,71 @@ Run this to see the exact data structure returned by the API
 
 import requests
 import json
+try:
+    import orjson  # Optional: much faster parsing/printing of large scan payloads
+except ImportError:
+    orjson = None
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Backend URL
 BASE_URL = "http://localhost:8000"
 
+# Shared session so all requests reuse one pooled connection
+SESSION = requests.Session()
+
+def parse_json(response):
+    """Decode a response body, using orjson when available"""
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+def dump_json(data):
+    """Serialize data as indented JSON, using orjson when available"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode()
+    return json.dumps(data, indent=2, default=str)
+
 def print_json(data, title=""):
     """Pretty print JSON data"""
     print("\n" + "="*80)
     print(f"  {title}")
     print("="*80)
-    print(json.dumps(data, indent=2, default=str))
+    print(dump_json(data))
     print("="*80 + "\n")
 
+def first_scan_id(data):
+    """Return the ID of the first scan in a history response, if any"""
+    if isinstance(data, dict) and data.get('scans'):
+        return data['scans'][0].get('scan_id') or data['scans'][0].get('id')
+    return None
+
+def fetch_scan_id():
+    """Fetch the most recent scan ID from the history endpoint"""
+    print("\n📥 Fetching scan ID from history...")
+    try:
+        response = SESSION.get(f"{BASE_URL}/api/test/scan/history/default-asset")
+        if response.ok:
+            scan_id = first_scan_id(parse_json(response))
+            if scan_id:
+                print(f"✅ Using scan ID: {scan_id}")
+            return scan_id
+    except Exception as e:
+        print(f"❌ Could not get scan ID: {e}")
+    return None
+
 def test_scan_history():
-    """Test the scan history endpoint"""
+    """Test the scan history endpoint and return the first scan ID"""
     print("\n🔍 Testing: GET /api/test/scan/history/default-asset")
+    scan_id = None
     
     try:
-        response = requests.get(f"{BASE_URL}/api/test/scan/history/default-asset")
+        response = SESSION.get(f"{BASE_URL}/api/test/scan/history/default-asset")
         print(f"Status Code: {response.status_code}")
         
         if response.ok:
-            data = response.json()
+            data = parse_json(response)
+            scan_id = first_scan_id(data)
             print_json(data, "SCAN HISTORY RESPONSE")
             
             # Analyze the structure
@@ -53,22 +95,14 @@ def test_scan_history():
     except Exception as e:
         print(f"❌ Exception: {e}")
 
-def test_scan_detail(scan_id=None):
-    """Test the scan detail endpoint"""
+    return scan_id
+
+def test_scan_detail(scan_id=None, pending=None):
+    """Test the scan detail endpoint (optionally using a prefetched request)"""
     
     # First get a scan ID if not provided
     if not scan_id:
-        print("\n📥 Fetching scan ID from history...")
-        try:
-            response = requests.get(f"{BASE_URL}/api/test/scan/history/default-asset")
-            if response.ok:
-                data = response.json()
-                if data.get('scans'):
-                    scan_id = data['scans'][0].get('scan_id') or data['scans'][0].get('id')
-                    print(f"✅ Using scan ID: {scan_id}")
-        except Exception as e:
-            print(f"❌ Could not get scan ID: {e}")
-            return
+        scan_id = fetch_scan_id()
     
     if not scan_id:
         print("❌ No scan ID available")
@@ -77,11 +111,11 @@ def test_scan_detail(scan_id=None):
     print(f"\n🔍 Testing: GET /api/test/scan/{scan_id}")
     
     try:
-        response = requests.get(f"{BASE_URL}/api/test/scan/{scan_id}")
+        response = pending.result() if pending else SESSION.get(f"{BASE_URL}/api/test/scan/{scan_id}")
         print(f"Status Code: {response.status_code}")
         
         if response.ok:
-            data = response.json()
+            data = parse_json(response)
             print_json(data, f"SCAN DETAIL RESPONSE - ID: {scan_id}")
             
             # Analyze parsed_results
@@ -113,22 +147,12 @@ def test_scan_detail(scan_id=None):
     except Exception as e:
         print(f"❌ Exception: {e}")
 
-def test_scan_results(scan_id=None):
-    """Test the scan results endpoint"""
+def test_scan_results(scan_id=None, pending=None):
+    """Test the scan results endpoint (optionally using a prefetched request)"""
     
     # First get a scan ID if not provided
     if not scan_id:
-        print("\n📥 Fetching scan ID from history...")
-        try:
-            response = requests.get(f"{BASE_URL}/api/test/scan/history/default-asset")
-            if response.ok:
-                data = response.json()
-                if data.get('scans'):
-                    scan_id = data['scans'][0].get('scan_id') or data['scans'][0].get('id')
-                    print(f"✅ Using scan ID: {scan_id}")
-        except Exception as e:
-            print(f"❌ Could not get scan ID: {e}")
-            return
+        scan_id = fetch_scan_id()
     
     if not scan_id:
         print("❌ No scan ID available")
@@ -137,11 +161,11 @@ def test_scan_results(scan_id=None):
     print(f"\n🔍 Testing: GET /api/test/scan/{scan_id}/results")
     
     try:
-        response = requests.get(f"{BASE_URL}/api/test/scan/{scan_id}/results")
+        response = pending.result() if pending else SESSION.get(f"{BASE_URL}/api/test/scan/{scan_id}/results")
         print(f"Status Code: {response.status_code}")
         
         if response.ok:
-            data = response.json()
+            data = parse_json(response)
             print_json(data, f"SCAN RESULTS - ID: {scan_id}")
         else:
             print(f"❌ Error: {response.text}")
@@ -157,14 +181,22 @@ def main():
     print("  Time:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     print("🚀"*40)
     
-    # Test 1: Scan History
-    test_scan_history()
+    # Test 1: Scan History (also resolves the scan ID for the other tests)
+    scan_id = test_scan_history()
     
-    # Test 2: Scan Detail
-    test_scan_detail()
-    
-    # Test 3: Scan Results
-    test_scan_results()
+    if not scan_id:
+        print("❌ No scan ID available")
+    else:
+        # Fetch detail and results concurrently, then report them in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            detail = executor.submit(SESSION.get, f"{BASE_URL}/api/test/scan/{scan_id}")
+            results = executor.submit(SESSION.get, f"{BASE_URL}/api/test/scan/{scan_id}/results")
+            
+            # Test 2: Scan Detail
+            test_scan_detail(scan_id, detail)
+            
+            # Test 3: Scan Results
+            test_scan_results(scan_id, results)
     
     print("\n" + "✅"*40)
     print("  TESTS COMPLETED")